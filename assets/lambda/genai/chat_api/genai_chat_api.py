@@ -1,30 +1,89 @@
-import json
+import asyncio
+import time
 import logging
-import sys
 import os
-from typing import Any, Dict
+from contextlib import AsyncExitStack
+from operator import itemgetter
+from typing import Any, Dict, List, Optional
+import aioboto3
 import boto3
-import json
+import orjson
 from botocore.exceptions import ClientError
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, trim_messages
+from langchain_core.runnables import ConfigurableFieldSpec, Runnable, RunnableLambda, RunnablePassthrough
 from langchain_core.runnables.history import RunnableWithMessageHistory
-from langchain_community.chat_message_histories import DynamoDBChatMessageHistory
 from messaging.publishers.websocket import WebSocketPublisher
 from messaging.service import MessageDeliveryService
-from model.streaming import StreamingCallback
+from model.bedrock_stream import BedrockConnectionError, astream_converse, to_converse_messages
+from model.history import PrefetchedChatMessageHistory, SharedTableChatMessageHistory, approximate_token_count, get_dax_table
+from model.streaming import AsyncStreamingCallback
+from utils.aws import BOTO_CLIENT_CONFIG
+from utils.cache import LLM_CACHE_MAX_SIZE, LRUCache
+from utils.errors import is_stale_connection_error
 from utils.enums import (
     FunctionResponseFields as funb,
+    Provider,
     WebSocketMessageFields as wssm,
 )
-from factories.provider_factory import ProviderFactory
+from factories.provider_factory import ProviderFactory, prefetch_api_keys, resolve_model, reset_clients as reset_provider_clients, warm_providers
+from providers.bedrock_provider import invalidate_bedrock_client
 from functools import lru_cache
 
-# Set up logging
+try:
+    from snapshot_restore_py import register_after_restore
+except ImportError:
+    # Only provided by Lambda runtimes with SnapStart enabled
+    register_after_restore = None
+
+# Set up logging (the Lambda runtime already attaches a handler to the root logger)
 LOGGER = logging.getLogger(__name__)
-LOGGER.setLevel(logging.DEBUG)
-HANDLER = logging.StreamHandler(sys.stdout)
-HANDLER.setFormatter(logging.Formatter("%(levelname)s | %(name)s | %(message)s"))
-LOGGER.addHandler(HANDLER)
+LOGGER.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+
+# A single event loop is kept for the lifetime of the container so async clients and
+# sessions created on it stay usable across warm invocations.
+_LOOP = asyncio.new_event_loop()
+_AIO_SESSION = aioboto3.Session()
+
+# Clients are created once per container and reused by every warm invocation.
+# Sync bedrock-runtime clients (used by ChatBedrock) are cached per region in providers.bedrock_provider.
+REGION = os.environ.get('REGION', 'us-west-2')
+_APIGW_CLIENTS: Dict[str, Any] = {}
+_APIGW_CLIENT_STACK = AsyncExitStack()
+_BEDROCK_ASYNC_CLIENT: Optional[Any] = None
+_BEDROCK_ASYNC_CLIENT_CM: Optional[Any] = None
+
+# (LLM, prompt | LLM chain) pairs keyed by id() of the provider-cached LLM. Bounded like the
+# provider LLM caches, so a chain ages out along with the LLM it wraps.
+_CHAINS = LRUCache(LLM_CACHE_MAX_SIZE)
+
+# Pre-encoded body for internal errors; details go to the logs, not to the caller
+_ERR_500 = orjson.dumps({'error': 'internal'}).decode()
+
+# Full tracebacks are logged at most once per exception type per interval
+_EXCEPTION_LOG_INTERVAL_SECONDS = 60
+_EXCEPTION_LOGGED_AT: Dict[str, float] = {}
+
+# Chat history goes through DAX when a cluster endpoint is configured
+DAX_ENDPOINT = os.environ.get('DAX_ENDPOINT')
+
+SYSTEM_PROMPT = "You are a helpful AI assistant."
+
+# Approximate token budget for the history sent to the model; 0 sends the full history.
+# Stored history is never truncated.
+HISTORY_MAX_TOKENS = int(os.environ.get('HISTORY_MAX_TOKENS', '4000'))
+
+# Static config spec exposing session_id to get_session_history
+_HISTORY_CFG = [
+    ConfigurableFieldSpec(
+        id="session_id",
+        annotation=str,
+        name="Session ID",
+        description="Unique identifier for the session.",
+        default="",
+        is_shared=True,
+    )
+]
 
 @lru_cache(maxsize=128)
 def get_model_configs() -> Dict[str, str]:
@@ -43,25 +102,69 @@ def extract_event_data(event: Dict[str, Any]) -> tuple:
         event (dict): The Lambda event.
 
     Returns:
-        tuple: Contains body, session_id, user_input, model_name, and max_tokens.
+        tuple: Contains session_id, user_input, model_name, max_tokens, and temperature.
+
+    Raises:
+        ValueError: If the body is not valid JSON or 'message' is not a non-empty string.
     """
+    raw_body = event.get('body')
     try:
-        body = json.loads(event.get('body', '{}')) if isinstance(event.get('body'), str) else event.get('body', {})
-    except json.JSONDecodeError as e:
-        LOGGER.error(f"Failed to parse event body: {e}")
+        body = orjson.loads(raw_body) if isinstance(raw_body, (bytes, str)) else (raw_body or {})
+    except orjson.JSONDecodeError as e:
+        LOGGER.error("Failed to parse event body: %s", e)
         raise ValueError(f"Invalid JSON in event body: {e}")
 
     session_id = body.get('session_id', 'test-session')
     user_input = body.get('message', '')
+    if not isinstance(user_input, str):
+        raise ValueError("'message' must be a string")
+    if not user_input.strip():
+        raise ValueError("'message' must not be empty")
     model_name = body.get('model_name', 'CLAUDE_3_5_SONNET')  # Default model
     max_tokens = int(body.get('max_tokens', os.environ.get('DEFAULT_MAX_TOKENS', 1000)))
     temperature = float(body.get('temperature', os.environ.get('DEFAULT_TEMPERATURE', 0.7)))
-    
-    LOGGER.debug(f"Extracted event data: session_id={session_id}, user_input={user_input}, model_name={model_name}, max_tokens={max_tokens}, temperature={temperature}")
-    return body, session_id, user_input, model_name, max_tokens, temperature
 
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug("Extracted event data: session_id=%s, user_input_len=%d, model_name=%s, max_tokens=%d, temperature=%s", session_id, len(user_input), model_name, max_tokens, temperature)
+    return session_id, user_input, model_name, max_tokens, temperature
+
+
+async def get_apigw_client(endpoint_url: str) -> Any:
+    """
+    Returns the API Gateway management client for a WebSocket stage, creating it on first use.
+    Clients stay open on _APIGW_CLIENT_STACK for the lifetime of the container.
+
+    Parameters:
+        endpoint_url (str): The WebSocket stage endpoint.
+
+    Returns:
+        An open aioboto3 apigatewaymanagementapi client.
+    """
+    client = _APIGW_CLIENTS.get(endpoint_url)
+    if client is None:
+        client = await _APIGW_CLIENT_STACK.enter_async_context(
+            _AIO_SESSION.client('apigatewaymanagementapi', endpoint_url=endpoint_url, config=BOTO_CLIENT_CONFIG)
+        )
+        _APIGW_CLIENTS[endpoint_url] = client
+    return client
+
+
+async def get_async_bedrock_client() -> Any:
+    """
+    Returns the aioboto3 bedrock-runtime client, opening it on first use. It stays open for
+    the lifetime of the container unless reset_bedrock_clients discards it.
 
-def attach_websocket_publisher(event: Dict[str, Any], message_service: MessageDeliveryService) -> None:
+    Returns:
+        An open aioboto3 bedrock-runtime client.
+    """
+    global _BEDROCK_ASYNC_CLIENT, _BEDROCK_ASYNC_CLIENT_CM
+    if _BEDROCK_ASYNC_CLIENT is None:
+        _BEDROCK_ASYNC_CLIENT_CM = _AIO_SESSION.client('bedrock-runtime', region_name=REGION, config=BOTO_CLIENT_CONFIG)
+        _BEDROCK_ASYNC_CLIENT = await _BEDROCK_ASYNC_CLIENT_CM.__aenter__()
+    return _BEDROCK_ASYNC_CLIENT
+
+
+async def attach_websocket_publisher(event: Dict[str, Any], message_service: MessageDeliveryService) -> None:
     """
     Attaches a WebSocketPublisher to the message service if possible.
 
@@ -72,13 +175,16 @@ def attach_websocket_publisher(event: Dict[str, Any], message_service: MessageDe
     try:
         connection_id = event['requestContext']['connectionId']
         endpoint_url = f"https://{event['requestContext']['domainName']}/{event['requestContext']['stage']}"
-        message_service.attach(WebSocketPublisher(endpoint_url=endpoint_url, connection_id=connection_id))
-        LOGGER.info(f"WebSocketPublisher attached with connection_id: {connection_id}")
     except KeyError:
         LOGGER.warning("RequestContext not present in event. WebSocketPublisher not attached.")
+        return
+
+    client = await get_apigw_client(endpoint_url)
+    message_service.attach(WebSocketPublisher(client=client, connection_id=connection_id))
+    LOGGER.info("WebSocketPublisher attached with connection_id: %s", connection_id)
 
 
-def initialize_llm(model_name: str, max_tokens: int, temperature: float, streaming_callback: StreamingCallback = None) -> Any:
+def initialize_llm(model_name: str, max_tokens: int, temperature: float, streaming_callback: AsyncStreamingCallback = None) -> Any:
     """
     Initializes the appropriate LLM based on the model name using the ProviderFactory.
 
@@ -86,7 +192,7 @@ def initialize_llm(model_name: str, max_tokens: int, temperature: float, streami
         model_name (str): The name of the model to instantiate.
         max_tokens (int): The maximum number of tokens for the model response.
         temperature (float): The temperature to set for the selected model.
-        streaming_callback (StreamingCallback, optional): Callback handler for streaming responses (required for Bedrock).
+        streaming_callback (AsyncStreamingCallback, optional): Callback handler for streaming responses.
 
     Returns:
         LLM: An instance of a LangChain LLM.
@@ -105,19 +211,60 @@ def initialize_llm(model_name: str, max_tokens: int, temperature: float, streami
 
     # Get the LLM instance from the provider
     llm = provider.get_llm()
-    LOGGER.debug(f"LLM initialized for model: {model_name} with max_tokens: {max_tokens} and temperature: {temperature}")
+    LOGGER.debug("LLM initialized for model: %s with max_tokens: %d and temperature: %s", model_name, max_tokens, temperature)
     return llm
 
 
+def trim_history(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """
+    Keeps the most recent messages that fit HISTORY_MAX_TOKENS, starting on a human turn.
+
+    Parameters:
+        messages (list): The session history, oldest first.
+
+    Returns:
+        list: The messages to send to the model.
+    """
+    if HISTORY_MAX_TOKENS <= 0:
+        return messages
+    return trim_messages(
+        messages,
+        max_tokens=HISTORY_MAX_TOKENS,
+        token_counter=approximate_token_count,
+        strategy="last",
+        start_on="human",
+    )
+
+
+def get_bedrock_model_id(model_name: str) -> Optional[str]:
+    """
+    Returns the Bedrock model ID for Bedrock models, which are streamed directly with the
+    Converse API rather than through LangChain.
+
+    Parameters:
+        model_name (str): The name of the model.
+
+    Returns:
+        str or None: The Bedrock model ID, or None if the LangChain path is used.
+
+    Raises:
+        ValueError: If the model is not supported.
+    """
+    provider, model_id = resolve_model(model_name)
+    return model_id if provider == Provider.BEDROCK else None
+
+
+@lru_cache(maxsize=1)
 def get_prompt_template() -> ChatPromptTemplate:
     """
     Creates the chat prompt template with a messages placeholder for history.
+    The template is static, so it is built once per container.
 
     Returns:
         ChatPromptTemplate: The chat prompt template.
     """
     prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are a helpful AI assistant."),
+        ("system", SYSTEM_PROMPT),
         MessagesPlaceholder(variable_name="history"),
         ("human", "{input}"),
     ])
@@ -125,29 +272,175 @@ def get_prompt_template() -> ChatPromptTemplate:
     return prompt
 
 
-def get_session_history(session_id: str) -> DynamoDBChatMessageHistory:
+@lru_cache(maxsize=1)
+def get_history_table() -> Any:
+    """
+    Returns the chat history Table, shared by every session history so they all use the
+    same (pre-warmed) connection pool. When DAX_ENDPOINT is set the Table goes through DAX.
+
+    Returns:
+        The DynamoDB (or DAX-backed) Table resource.
+    """
+    table_name = os.environ['CHAT_HISTORY_TABLE_NAME']
+    if DAX_ENDPOINT:
+        return get_dax_table(DAX_ENDPOINT, table_name)
+    return boto3.resource('dynamodb', config=BOTO_CLIENT_CONFIG).Table(table_name)
+
+
+@lru_cache(maxsize=128)
+def get_session_history(session_id: str) -> SharedTableChatMessageHistory:
     """
     Retrieves the chat message history for a given session.
+    History objects are memoized per session and all share one Table resource;
+    messages are still read from the table on every access.
 
     Parameters:
         session_id (str): The session ID.
 
     Returns:
-        DynamoDBChatMessageHistory: The chat message history.
+        SharedTableChatMessageHistory: The chat message history.
     """
-    history = DynamoDBChatMessageHistory(
-        table_name=os.environ['CHAT_HISTORY_TABLE_NAME'],
+    history = SharedTableChatMessageHistory(
+        table=get_history_table(),
         session_id=session_id,
         primary_key_name="session_id"
     )
-    LOGGER.debug(f"Retrieved session history for session_id: {session_id}")
+    LOGGER.debug("Retrieved session history for session_id: %s", session_id)
     return history
 
 
+def get_chain(model_name: str, max_tokens: int, temperature: float) -> Runnable:
+    """
+    Returns the prompt | LLM chain, memoized per LLM instance. The providers cache the LLM
+    per configuration (and API key), so the chain is only rebuilt when the LLM is.
+    The chain holds no request state: history is attached per request and the streaming
+    callback is bound with `.with_config`. When HISTORY_MAX_TOKENS is set, only the most
+    recent turns that fit the budget are passed to the prompt.
+
+    Parameters:
+        model_name (str): The name of the model to instantiate.
+        max_tokens (int): The maximum number of tokens for the model response.
+        temperature (float): The temperature to set for the selected model.
+
+    Returns:
+        Runnable: The prompt | LLM chain.
+    """
+    llm = initialize_llm(model_name, max_tokens, temperature)
+    entry = _CHAINS.get(id(llm))
+    # Holding the LLM in the entry keeps its id from being reused while the entry exists
+    if entry is not None and entry[0] is llm:
+        return entry[1]
+
+    chain = get_prompt_template() | llm
+    if HISTORY_MAX_TOKENS > 0:
+        chain = RunnablePassthrough.assign(history=itemgetter("history") | RunnableLambda(trim_history)) | chain
+    _CHAINS.put(id(llm), (llm, chain))
+    return chain
+
+
+def log_unexpected_exception(e: Exception) -> None:
+    """
+    Logs an unexpected exception, including its traceback only if that exception type
+    has not been logged with one in the last _EXCEPTION_LOG_INTERVAL_SECONDS.
+
+    Parameters:
+        e (Exception): The exception to log.
+    """
+    exc_type = type(e).__name__
+    now = time.monotonic()
+    if now - _EXCEPTION_LOGGED_AT.get(exc_type, float('-inf')) >= _EXCEPTION_LOG_INTERVAL_SECONDS:
+        _EXCEPTION_LOGGED_AT[exc_type] = now
+        LOGGER.exception("An unexpected error occurred", extra={'exc_type': exc_type})
+    else:
+        LOGGER.error("An unexpected error occurred: %s", exc_type, extra={'exc_type': exc_type})
+
+
+async def reset_bedrock_clients() -> None:
+    """
+    Discards the shared bedrock-runtime clients after a stale-connection error so the next
+    request opens a fresh connection pool instead of reusing the broken one. Chains built
+    on LLMs that use the old sync client are dropped with it.
+    """
+    global _BEDROCK_ASYNC_CLIENT, _BEDROCK_ASYNC_CLIENT_CM
+    invalidate_bedrock_client(REGION)
+    _CHAINS.clear()
+
+    client_cm, _BEDROCK_ASYNC_CLIENT, _BEDROCK_ASYNC_CLIENT_CM = _BEDROCK_ASYNC_CLIENT_CM, None, None
+    if client_cm is not None:
+        try:
+            await client_cm.__aexit__(None, None, None)
+        except Exception:
+            LOGGER.debug("Failed to close the stale Bedrock client", exc_info=True)
+
+
+async def reset_apigw_clients() -> None:
+    """
+    Discards the cached API Gateway Management API clients so the next publish opens a
+    fresh connection pool.
+    """
+    global _APIGW_CLIENT_STACK
+    client_stack, _APIGW_CLIENT_STACK = _APIGW_CLIENT_STACK, AsyncExitStack()
+    _APIGW_CLIENTS.clear()
+    try:
+        await client_stack.aclose()
+    except Exception:
+        LOGGER.debug("Failed to close the stale API Gateway clients", exc_info=True)
+
+
+def reset_history_clients() -> None:
+    """
+    Discards the cached chat history table (DynamoDB or DAX) and the histories built on it.
+    """
+    get_dax_table.cache_clear()
+    get_history_table.cache_clear()
+    get_session_history.cache_clear()
+
+
+async def stale_connection_response(e: Exception) -> Dict[str, Any]:
+    """
+    Recovers from a stale-connection error by recreating the clients that may have raised it,
+    and builds the response for the failed request. Errors from the Bedrock stream are raised
+    as BedrockConnectionError; any other stale error came from the chat history table or
+    from publishing to the WebSocket.
+
+    Parameters:
+        e (Exception): The stale-connection error.
+
+    Returns:
+        dict: The 500 response.
+    """
+    if isinstance(e, BedrockConnectionError):
+        LOGGER.warning("Bedrock connection went stale, recreating the Bedrock clients: %s", e)
+        await reset_bedrock_clients()
+    else:
+        LOGGER.warning("Connection went stale, recreating the chat history and API Gateway clients: %s", e)
+        reset_history_clients()
+        await reset_apigw_clients()
+    return {
+        funb.STATUS_CODE: 500,
+        funb.BODY: _ERR_500
+    }
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     AWS Lambda function handler for processing chat messages.
 
+    Parameters:
+        event (dict): The Lambda event payload.
+        context: The Lambda runtime information.
+
+    Returns:
+        dict: The response object containing status code and body.
+    """
+    return _LOOP.run_until_complete(_handler(event, context))
+
+
+async def _handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Async implementation of lambda_handler. Tokens are published to the WebSocket while
+    the model stream is still being read.
+
     Parameters:
         event (dict): The Lambda event payload.
         context: The Lambda runtime information.
@@ -160,52 +453,68 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     try:
         # Extract data from the event
-        LOGGER.debug(f"Received event: {event}")
-        body, session_id, user_input, model_name, max_tokens, temperature  = extract_event_data(event)
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Received event: %s", {key: value for key, value in event.items() if key != 'body'})
+        session_id, user_input, model_name, max_tokens, temperature = extract_event_data(event)
 
         # Attach WebSocketPublisher if available
-        attach_websocket_publisher(event, message_service)
+        await attach_websocket_publisher(event, message_service)
+
+        # Initialize the AsyncStreamingCallback with message_service
+        streaming_callback = AsyncStreamingCallback(message_service=message_service)
+
+        # Bedrock models are streamed directly with the async Converse API, without the
+        # Runnable machinery per token and without blocking the loop on stream reads
+        model_id = get_bedrock_model_id(model_name)
+        if model_id:
+            LOGGER.info("Starting to process user input for session_id: %s with model: %s", session_id, model_name)
+            history, bedrock_client = await asyncio.gather(
+                PrefetchedChatMessageHistory.aprefetch(get_session_history(session_id)),
+                get_async_bedrock_client(),
+            )
+            human_message = HumanMessage(content=user_input)
+            answer = await astream_converse(
+                bedrock_client,
+                model_id=model_id,
+                system=SYSTEM_PROMPT,
+                messages=to_converse_messages(trim_history(history.messages) + [human_message]),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                streaming_callback=streaming_callback,
+            )
+            # A stream that produced no text (e.g. a guardrail stop) stores no answer: Converse
+            # rejects blank turns, so it would break every later turn of the session
+            new_messages = [human_message, AIMessage(content=answer)] if answer.strip() else [human_message]
+            await history.aadd_messages(new_messages)
 
-        # Initialize the StreamingCallback with message_service
-        streaming_callback = StreamingCallback(message_service=message_service)
-
-        # Initialize LLM
-        llm = initialize_llm(model_name, max_tokens, temperature, streaming_callback)
-
-        # Get prompt template
-        prompt = get_prompt_template()
+            LOGGER.info("Response streaming completed.")
+            return {
+                funb.STATUS_CODE: 200,
+                funb.BODY: orjson.dumps({wssm.MESSAGE.value: 'Response streaming started'}).decode()
+            }
 
-        if streaming_callback:
-            chain = (prompt | llm).with_config(callbacks=[streaming_callback])
-        else:
-            # For non-streaming models
-            chain = (prompt | llm)
+        # Read the session history while the chain (and any provider secret) is prepared
+        history, chain = await asyncio.gather(
+            PrefetchedChatMessageHistory.aprefetch(get_session_history(session_id)),
+            asyncio.to_thread(get_chain, model_name, max_tokens, temperature),
+        )
 
-        # Wrap the chain with message history and include callbacks
+        # Wrap the chain with the already-read history
         chain_with_history = RunnableWithMessageHistory(
             runnable=chain,
-            get_session_history=get_session_history,
+            get_session_history=lambda _session_id: history,
             input_messages_key="input",
             history_messages_key="history",
-            history_factory_config=[
-                {
-                    "id": "session_id",
-                    "annotation": str,
-                    "name": "Session ID",
-                    "description": "Unique identifier for the session.",
-                    "default": "",
-                    "is_shared": True,
-                }
-            ]
+            history_factory_config=_HISTORY_CFG
         )
 
         if streaming_callback:
             chain_with_history = chain_with_history.with_config(callbacks=[streaming_callback])
 
-        # Generate response using the 'stream' method (for streaming models)
+        # Generate response using the 'astream' method (for streaming models)
         if streaming_callback:
-            LOGGER.info(f"Starting to process user input for session_id: {session_id} with model: {model_name}")
-            for _ in chain_with_history.stream(
+            LOGGER.info("Starting to process user input for session_id: %s with model: %s", session_id, model_name)
+            async for _ in chain_with_history.astream(
                 {"input": user_input},
                 config={"configurable": {"session_id": session_id}}
             ):
@@ -214,39 +523,92 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             LOGGER.info("Response streaming completed.")
             return {
                 funb.STATUS_CODE: 200,
-                funb.BODY: json.dumps({wssm.MESSAGE: 'Response streaming started'})
+                funb.BODY: orjson.dumps({wssm.MESSAGE.value: 'Response streaming started'}).decode()
             }
         else:
             # Handle non-streaming models
-            LOGGER.info(f"Starting to process user input for session_id: {session_id} with model: {model_name}")
-            response = chain_with_history.run({"input": user_input}, config={"configurable": {"session_id": session_id}})
+            LOGGER.info("Starting to process user input for session_id: %s with model: %s", session_id, model_name)
+            response = await chain_with_history.ainvoke({"input": user_input}, config={"configurable": {"session_id": session_id}})
             LOGGER.info("Response processing completed.")
             return {
                 funb.STATUS_CODE: 200,
-                funb.BODY: json.dumps({wssm.MESSAGE: response})
+                funb.BODY: orjson.dumps({wssm.MESSAGE.value: response.content}).decode()
             }
 
     except ClientError as e:
-        LOGGER.error(f"An AWS ClientError occurred: {e.response['Error']['Message']}")
+        error_code = e.response['Error']['Code']
+        LOGGER.error("An AWS ClientError occurred: %s", error_code, extra={'code': error_code})
         return {
             funb.STATUS_CODE: 500,
-            funb.BODY: json.dumps({'error': str(e)})
+            funb.BODY: _ERR_500
         }
-    except json.JSONDecodeError as je:
-        LOGGER.error(f"JSON Decode Error: {je}")
+    except orjson.JSONDecodeError as je:
+        LOGGER.error("JSON Decode Error: %s", je)
         return {
             funb.STATUS_CODE: 400,
-            funb.BODY: json.dumps({'error': f"Invalid JSON: {str(je)}"})
+            funb.BODY: orjson.dumps({'error': f"Invalid JSON: {str(je)}"}).decode()
         }
     except ValueError as ve:
-        LOGGER.error(f"ValueError: {ve}")
+        # LangChain re-raises client errors as ValueError
+        if is_stale_connection_error(ve):
+            return await stale_connection_response(ve)
+        LOGGER.error("ValueError: %s", ve)
         return {
             funb.STATUS_CODE: 400,
-            funb.BODY: json.dumps({'error': str(ve)})
+            funb.BODY: orjson.dumps({'error': str(ve)}).decode()
         }
     except Exception as e:
-        LOGGER.exception("An unexpected error occurred")
+        if is_stale_connection_error(e):
+            return await stale_connection_response(e)
+        log_unexpected_exception(e)
         return {
             funb.STATUS_CODE: 500,
-            funb.BODY: json.dumps({'error': str(e)})
+            funb.BODY: _ERR_500
         }
+
+
+def _warmup() -> None:
+    """
+    Opens connections and fills caches during container init so the first request
+    does not pay for them.
+    """
+    try:
+        _LOOP.run_until_complete(get_async_bedrock_client())
+    except Exception:
+        LOGGER.warning("Bedrock client warmup failed", exc_info=True)
+
+    try:
+        table = get_history_table()
+        if not DAX_ENDPOINT:
+            table.load()
+    except Exception:
+        LOGGER.warning("Chat history warmup failed", exc_info=True)
+
+    try:
+        warm_providers()
+    except Exception:
+        LOGGER.warning("Provider warmup failed", exc_info=True)
+
+    # Fetch every provider API key in one call so first requests are served from the secret cache
+    try:
+        prefetch_api_keys()
+    except Exception:
+        LOGGER.warning("Failed to pre-fetch provider API keys", exc_info=True)
+
+
+def _after_restore() -> None:
+    """
+    Runs after a SnapStart restore. Connections opened before the snapshot do not survive it,
+    so every cached client is dropped and the warmup runs again on the restored environment.
+    """
+    _LOOP.run_until_complete(reset_bedrock_clients())
+    _LOOP.run_until_complete(reset_apigw_clients())
+    reset_history_clients()
+    reset_provider_clients()
+    _warmup()
+
+
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    _warmup()
+    if register_after_restore is not None:
+        register_after_restore(_after_restore)
@@ -1,9 +1,32 @@
 import boto3
 import json
+import logging
 import os
+from botocore.config import Config
+
+# The Lambda runtime already attaches a handler to the root logger
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+
+_BOTO_CFG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=64,
+    connect_timeout=1,
+    read_timeout=60,
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+)
+
+# API Gateway management clients, one per stage endpoint, reused across warm invocations
+_APIGW_CLIENTS = {}
+
+def get_apigw_client(endpoint_url):
+    client = _APIGW_CLIENTS.get(endpoint_url)
+    if client is None:
+        client = _APIGW_CLIENTS[endpoint_url] = boto3.client('apigatewaymanagementapi', endpoint_url=endpoint_url, config=_BOTO_CFG)
+    return client
 
 def lambda_handler(event, context):
-    print("Event:", event)
+    LOGGER.debug("Event: %s", event)
 
     # Extract connection details
     connection_id = event['requestContext']['connectionId']
@@ -11,11 +34,10 @@ def lambda_handler(event, context):
     stage = event['requestContext']['stage']
     endpoint_url = f"https://{domain_name}/{stage}"
 
-    print("Connection ID:", connection_id)
-    print("Endpoint URL:", endpoint_url)
+    LOGGER.info("Connection ID: %s, endpoint URL: %s", connection_id, endpoint_url)
 
-    # Initialize the API Gateway management client
-    apigw_client = boto3.client('apigatewaymanagementapi', endpoint_url=endpoint_url)
+    # Get the API Gateway management client
+    apigw_client = get_apigw_client(endpoint_url)
 
     message = {
         'message': 'Use the chat route to send a message. Your info:',
@@ -26,14 +48,14 @@ def lambda_handler(event, context):
     # Send the message back to the client
     try:
         apigw_client.post_to_connection(
-            Data=json.dumps(message).encode('utf-8'),
+            Data=json.dumps(message, separators=(',', ':')).encode('utf-8'),
             ConnectionId=connection_id
         )
     except apigw_client.exceptions.GoneException:
         # Handle the case where the connection is no longer available
-        print(f"Connection {connection_id} is gone.")
+        LOGGER.info("Connection %s is gone.", connection_id)
     except Exception as e:
-        print(f"Error sending message: {e}")
+        LOGGER.error("Error sending message: %s", e)
 
     return {
         'statusCode': 200,
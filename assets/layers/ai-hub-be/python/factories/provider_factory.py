@@ -1,49 +1,227 @@
 from providers.base_provider import BaseProvider
-from providers.bedrock_provider import BedrockProvider
-from providers.openai_provider import OpenAIProvider
-# from providers.google_provider import GoogleProvider
 from utils.enums import Provider, BedrockModel, OpenAiModel
-from model.streaming import StreamingCallback
+from model.streaming import AsyncStreamingCallback
+from utils.errors import is_stale_connection_error
+from utils.aws import BOTO_CLIENT_CONFIG
 import os
-import json
+import orjson
+import importlib
 import logging
+import time
 import boto3
 from botocore.exceptions import ClientError
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# Provider -> name of the secret holding its API key, read from the environment once.
+# Providers without a configured secret map to None, so misses are answered from here too.
+_SECRET_NAMES: Mapping[Provider, Optional[str]] = MappingProxyType({
+    Provider.OPENAI: os.environ.get("OPENAI_SECRET_NAME"),
+    Provider.GOOGLE: os.environ.get("GOOGLE_SECRET_NAME"),
+    # Add other providers here
+})
+
+# Secrets rotate rarely, so values are kept in-process and refreshed after the TTL
+SECRET_CACHE_TTL_SECONDS = int(os.environ.get('SECRET_CACHE_TTL_SECONDS', '600'))
+_SECRET_CACHE: Dict[Tuple[str, str], Tuple[str, float]] = {}
+_SM_CLIENT = None
+
+# Model name -> (provider, model ID), built once and frozen since the model enums never change at runtime
+_MODEL_TABLE: Mapping[str, Tuple[Provider, str]] = MappingProxyType({
+    **{model.name: (Provider.BEDROCK, model.value) for model in BedrockModel},
+    **{model.name: (Provider.OPENAI, model.value) for model in OpenAiModel},
+    # **{model.name: (Provider.GOOGLE, model.value) for model in GoogleModel},
+})
+
+
+def _get_sm_client() -> Any:
+    """
+    Returns the Secrets Manager client, created on first use and reused for the life of the container.
+
+    Returns:
+        The boto3 Secrets Manager client.
+    """
+    global _SM_CLIENT
+    if _SM_CLIENT is None:
+        _SM_CLIENT = boto3.client('secretsmanager', region_name=os.environ.get('REGION'), config=BOTO_CLIENT_CONFIG)
+    return _SM_CLIENT
+
+
+@lru_cache(maxsize=64)
+def resolve_model(model_name: str) -> Tuple[Provider, str]:
+    """
+    Resolves a model name to its provider and model ID, memoized since model names come from a small fixed set.
+
+    Parameters:
+        model_name (str): The name of the model, e.g. "CLAUDE_3_5_HAIKU".
+
+    Returns:
+        tuple: The provider and the provider's model ID.
+
+    Raises:
+        ValueError: If the model is not supported.
+    """
+    resolved = _MODEL_TABLE.get(model_name)
+    if resolved is None:
+        raise ValueError(f"{model_name} is not a currently supported model")
+    return resolved
+
+
+def warm_providers() -> None:
+    """
+    Creates the Secrets Manager client and imports the integrations of the configured providers,
+    so container init (or the SnapStart snapshot) pays for them instead of the first request.
+    """
+    _get_sm_client()
+    if _SECRET_NAMES[Provider.OPENAI]:
+        importlib.import_module("providers.openai_provider")
+        importlib.import_module("langchain_openai")
+
+
+def reset_clients() -> None:
+    """
+    Drops the cached Secrets Manager client and secret values, e.g. after a SnapStart restore,
+    where pooled connections and monotonic-clock deadlines from before the snapshot are not valid.
+    """
+    global _SM_CLIENT
+    _SM_CLIENT = None
+    _SECRET_CACHE.clear()
+
+
+def _call_sm(operation: str, **kwargs) -> Dict[str, Any]:
+    """
+    Calls a Secrets Manager operation, rebuilding the client and retrying once if its
+    pooled connection went stale.
+
+    Parameters:
+        operation (str): The client method to call, e.g. "get_secret_value".
+        **kwargs: The operation's parameters.
+
+    Returns:
+        dict: The operation's response.
+    """
+    global _SM_CLIENT
+    try:
+        return getattr(_get_sm_client(), operation)(**kwargs)
+    except Exception as e:
+        if not is_stale_connection_error(e):
+            raise
+        LOGGER.warning("Secrets Manager connection went stale, recreating the client: %s", e)
+        _SM_CLIENT = None
+        return getattr(_get_sm_client(), operation)(**kwargs)
+
+
+def get_secret(secret_name: str, secret_key: str = "api_key") -> str:
+    """
+    Retrieves a value from a JSON secret in AWS Secrets Manager, cached for SECRET_CACHE_TTL_SECONDS.
+
+    Parameters:
+        secret_name (str): The name of the secret.
+        secret_key (str, optional): The key to read from the secret's JSON payload. Defaults to "api_key".
+
+    Returns:
+        str: The secret value.
+
+    Raises:
+        ClientError: If there is an error retrieving the secret.
+        KeyError: If the key is not found in the secret.
+    """
+    cache_key = (secret_name, secret_key)
+    cached = _SECRET_CACHE.get(cache_key)
+    if cached and time.monotonic() < cached[1]:
+        return cached[0]
+
+    try:
+        get_secret_value_response = _call_sm('get_secret_value', SecretId=secret_name)
+    except ClientError as e:
+        # Drop any expired value so a rotated or deleted secret is never served again
+        _SECRET_CACHE.pop(cache_key, None)
+        raise e
+
+    # Parse the JSON string to get the actual value
+    secret_dict = orjson.loads(get_secret_value_response['SecretString'])
+    value = secret_dict.get(secret_key)
+    if not value:
+        raise KeyError(f"'{secret_key}' not found in secret '{secret_name}'")
+
+    _SECRET_CACHE[cache_key] = (value, time.monotonic() + SECRET_CACHE_TTL_SECONDS)
+    return value
+
+
+def prefetch_api_keys(secret_names: Optional[List[str]] = None) -> int:
+    """
+    Reads the API key secrets of all configured providers with a single BatchGetSecretValue call
+    and fills the secret cache. Secrets that cannot be read here are fetched individually by get_secret.
+
+    Parameters:
+        secret_names (list, optional): Secret names or ARNs to read. Defaults to every configured provider secret.
+
+    Returns:
+        int: The number of API keys cached.
+
+    Raises:
+        ClientError: If the batch call itself fails.
+    """
+    if secret_names is None:
+        secret_names = list(_SECRET_NAMES.values())
+    secret_names = [secret_name for secret_name in secret_names if secret_name]
+    if not secret_names:
+        return 0
+
+    response = _call_sm('batch_get_secret_value', SecretIdList=secret_names)
+    deadline = time.monotonic() + SECRET_CACHE_TTL_SECONDS
+    cached = 0
+    for secret in response.get('SecretValues', []):
+        value = orjson.loads(secret.get('SecretString') or '{}').get('api_key')
+        if not value:
+            continue
+        # Cache under the identifier get_secret will be called with, name or ARN
+        secret_id = secret['Name'] if secret['Name'] in secret_names else secret['ARN']
+        _SECRET_CACHE[(secret_id, 'api_key')] = (value, deadline)
+        cached += 1
+
+    for error in response.get('Errors', []):
+        LOGGER.warning("Could not prefetch secret %s: %s", error.get('SecretId'), error.get('ErrorCode'))
+    return cached
+
 
 class ProviderFactory:
     """
     Factory class to instantiate AI model providers based on the provider type.
     """
 
-    def __init__(self, model_name: str, streaming_callback: StreamingCallback = None, max_tokens: int = 1000, temperature: float = 0.7) -> None:
+    def __init__(self, model_name: str, streaming_callback: AsyncStreamingCallback = None, max_tokens: int = 1000, temperature: float = 0.7, bedrock_client: Any = None) -> None:
         """
         Initialize the ProviderFactory with necessary parameters.
         
         Parameters:
         model_name (str): The name of the model to instantiate.
-        streaming_callback (StreamingCallback, optional): Callback handler for streaming responses.
+        streaming_callback (AsyncStreamingCallback, optional): Callback handler for streaming responses. Leave unset to bind callbacks per call with `.with_config`.
         api_key (str, optional): API key for OpenAI models.
         max_tokens (int, optional): Maximum number of tokens in the model's response. Defaults to 1000.
         temperature (float, optional): Temperature to set for the model. Defaults to 0.7.
+        bedrock_client (optional): bedrock-runtime client to use for Bedrock models. Defaults to the cached client for REGION.
         """
         self.model_name = model_name
-        self.provider = self._get_provider_type()
+        self.provider, self.model_id = resolve_model(model_name)
         self.streaming_callback = streaming_callback
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.bedrock_client = bedrock_client
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.logger.debug(f"ProviderFactory initialized with model_name: {self.model_name}, max_tokens: {self.max_tokens}, temperature: {self.temperature}")
+        # All validation happens here, so get_provider has no failure branches of its own
+        builder_name = self._PROVIDER_BUILDERS.get(self.provider)
+        if builder_name is None:
+            self.logger.error("Unsupported or unknown model name: %s", self.model_name)
+            raise ValueError(f"Unsupported or unknown model name: {self.model_name}")
+        # if self.provider == Provider.GOOGLE and not self.streaming_callback:
+        #     raise ValueError("Streaming callback is required for Google AI Models")
+        self._build_provider = getattr(self, builder_name)
+        self.logger.debug("ProviderFactory initialized with model_name: %s, max_tokens: %s, temperature: %s", self.model_name, self.max_tokens, self.temperature)
     
-    def _get_provider_type(self):
-        if self.model_name in BedrockModel.__members__:
-            return Provider.BEDROCK
-        elif self.model_name in OpenAiModel.__members__:
-            return Provider.OPENAI
-        # elif self.model_name in GoogleModel.__members__:
-        #     return Provider.GOOGLE
-        else:
-            raise ValueError(f"{self.model_name} is not a currently supported model")
-        
     def _get_api_key(self, provider: Provider) -> str:
         """
         Retrieves the API key for the specified provider from AWS Secrets Manager.
@@ -58,39 +236,20 @@ class ProviderFactory:
             ClientError: If there is an error retrieving the secret.
             KeyError: If the secret or key is not found.
         """
-        secret_name_mapping = {
-            Provider.OPENAI: os.environ.get("OPENAI_SECRET_NAME"),
-            Provider.GOOGLE: os.environ.get("GOOGLE_SECRET_NAME"),
-            # Add other providers here
-        }
-
-        secret_name = secret_name_mapping.get(provider)
+        secret_name = _SECRET_NAMES.get(provider)
         if not secret_name:
             raise ValueError(f"No secret name configured for provider: {provider}")
 
-        client = boto3.client('secretsmanager')
         try:
-            self.logger.info(f"Attempting to retrieve secret: {secret_name}")
-            get_secret_value_response = client.get_secret_value(SecretId=secret_name)
-
-            # Extract and parse the secret string
-            secret_string = get_secret_value_response['SecretString']
-            self.logger.debug(f"Secret string retrieved: {secret_string}")
-
-            # Parse the JSON string to get the actual value
-            secret_dict = json.loads(secret_string)
-            api_key = secret_dict.get("api_key")
-
-            if not api_key:
-                raise KeyError(f"'api_key' not found in secret '{secret_name}'")
-            
-            self.logger.info(f"Successfully retrieved API key for provider: {provider}")
+            self.logger.debug("Attempting to retrieve secret: %s", secret_name)
+            api_key = get_secret(secret_name, "api_key")
+            self.logger.debug("Successfully retrieved API key for provider: %s", provider)
             return api_key
         except ClientError as e:
-            self.logger.error(f"Error retrieving secret named {secret_name}: {e}")
+            self.logger.error("Error retrieving secret named %s: %s", secret_name, e)
             raise e
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Error decoding JSON from secret '{secret_name}': {e}")
+        except orjson.JSONDecodeError as e:
+            self.logger.error("Error decoding JSON from secret '%s': %s", secret_name, e)
             raise e
         except KeyError as e:
             self.logger.error(str(e))
@@ -98,37 +257,42 @@ class ProviderFactory:
     
     def get_provider(self) -> BaseProvider:
         """
-        Determine the provider based on the model name and instantiate the corresponding provider.
+        Instantiate the provider for the model. The builder for the model's provider is bound in __init__,
+        so this is a direct call rather than a comparison against each provider.
+        Provider modules are imported by the builders so a container only loads the LangChain integration it uses.
         
         Returns:
             BaseProvider: An instance of a provider implementing BaseProvider.
         
         Raises:
-            ValueError: If the provider for the given model is unsupported or not found.
+            ClientError: If the provider's API key cannot be retrieved.
         """
-        if self.provider == Provider.BEDROCK:
-            model_id = BedrockModel[self.model_name].value
-            self.logger.debug(f"Model '{self.model_name}' identified as Bedrock model with ID '{model_id}'")
-            if not self.streaming_callback:
-                raise ValueError("Streaming callback is required for Bedrock Models")
-            return BedrockProvider(model_id=model_id, streaming_callback=self.streaming_callback, max_tokens=self.max_tokens, temperature=self.temperature)
-        
-        elif self.provider == Provider.OPENAI:
-            model_id = OpenAiModel[self.model_name].value
-            self.logger.debug(f"Model '{self.model_name}' identified as OpenAi model with ID '{model_id}'")
-            api_key = self._get_api_key(self.provider)
-            if not self.streaming_callback:
-                raise ValueError("Streaming callback is required for OpenAi Models")
-            return OpenAIProvider(model_id=model_id, api_key=api_key, streaming_callback=self.streaming_callback, max_tokens=self.max_tokens, temperature=self.temperature)
-        
-        # elif self.provider == Provider.GOOGLE:
-        #     model_id = GoogleModel[self.model_name].value
-        #     self.logger.debug(f"Model '{self.model_name}' identified as Google AI model with ID '{model_id}'")
-        #     api_key = self._get_api_key(self.provider)
-        #     if not self.streaming_callback:
-        #         raise ValueError("Streaming callback is required for Google AI Models")
-        #     return GoogleProvider(model_id=model_id, api_key=api_key, streaming_callback=self.streaming_callback, max_output_tokens=self.max_tokens, temperature=self.temperature)
-        
-        else:
-            self.logger.error(f"Unsupported or unknown model name: {self.model_name}")
-            raise ValueError(f"Unsupported or unknown model name: {self.model_name}")
+        return self._build_provider()
+
+    def _get_bedrock_provider(self) -> BaseProvider:
+        from providers.bedrock_provider import BedrockProvider, get_bedrock_client
+        model_id = self.model_id
+        bedrock_client = self.bedrock_client or get_bedrock_client(os.environ.get('REGION', 'us-west-2'))
+        self.logger.debug("Model '%s' identified as Bedrock model with ID '%s'", self.model_name, model_id)
+        return BedrockProvider(model_id=model_id, streaming_callback=self.streaming_callback, max_tokens=self.max_tokens, temperature=self.temperature, client=bedrock_client)
+
+    def _get_openai_provider(self) -> BaseProvider:
+        from providers.openai_provider import OpenAIProvider
+        model_id = self.model_id
+        self.logger.debug("Model '%s' identified as OpenAi model with ID '%s'", self.model_name, model_id)
+        api_key = self._get_api_key(self.provider)
+        return OpenAIProvider(model_id=model_id, api_key=api_key, streaming_callback=self.streaming_callback, max_tokens=self.max_tokens, temperature=self.temperature)
+
+    # def _get_google_provider(self) -> BaseProvider:
+    #     from providers.google_provider import GoogleProvider
+    #     model_id = self.model_id
+    #     self.logger.debug(f"Model '{self.model_name}' identified as Google AI model with ID '{model_id}'")
+    #     api_key = self._get_api_key(self.provider)
+    #     return GoogleProvider(model_id=model_id, api_key=api_key, streaming_callback=self.streaming_callback, max_output_tokens=self.max_tokens, temperature=self.temperature)
+
+    # Provider -> name of the method that builds it
+    _PROVIDER_BUILDERS = {
+        Provider.BEDROCK: "_get_bedrock_provider",
+        Provider.OPENAI: "_get_openai_provider",
+        # Provider.GOOGLE: "_get_google_provider",
+    }
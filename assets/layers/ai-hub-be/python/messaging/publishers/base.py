@@ -4,5 +4,5 @@ from typing import Any
 
 class BasePublisher(ABC):
     @abstractmethod
-    def publish(self, payload: Any) -> None:
-        pass
\ No newline at end of file
+    async def publish_async(self, payload: Any) -> None:
+        pass
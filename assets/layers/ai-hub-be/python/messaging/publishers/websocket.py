@@ -1,15 +1,19 @@
 from typing import Any
-import boto3
 from messaging.publishers.base import BasePublisher
 
 class WebSocketPublisher(BasePublisher):
-    def __init__(self, endpoint_url: str, connection_id: str) -> None:
-        self._client = boto3.client("apigatewaymanagementapi", endpoint_url=endpoint_url)
+    def __init__(self, client: Any, connection_id: str) -> None:
+        """
+        Parameters:
+            client: An open aioboto3 apigatewaymanagementapi client for the WebSocket stage.
+            connection_id (str): The WebSocket connection to post to.
+        """
+        self._client = client
         self._connection_id = connection_id
         super().__init__()
 
-    def publish(self, payload: Any) -> None:
-        self._client.post_to_connection(
-            Data=payload.encode('utf-8'),
+    async def publish_async(self, payload: Any) -> None:
+        await self._client.post_to_connection(
+            Data=payload if isinstance(payload, bytes) else payload.encode('utf-8'),
             ConnectionId=self._connection_id,
         )
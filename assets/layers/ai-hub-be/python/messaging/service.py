@@ -13,6 +13,6 @@ class MessageDeliveryService:
     def detach(self, publisher: BasePublisher) -> None:
         self._publishers.remove(publisher)
 
-    def post(self, payload: Any) -> None:
+    async def publish_async(self, payload: Any) -> None:
         for publisher in self._publishers:
-            publisher.publish(payload)
+            await publisher.publish_async(payload)
@@ -0,0 +1,125 @@
+from typing import Any, AsyncIterator, Dict, List, Sequence
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from model.streaming import AsyncStreamingCallback
+from utils.errors import is_stale_connection_error
+
+# Models that reject a Converse system prompt; the prompt is folded into the first user turn instead
+_NO_SYSTEM_PROMPT_MODEL_PREFIXES = ("mistral.mistral-7b-instruct", "mistral.mixtral-8x7b-instruct")
+
+
+class BedrockConnectionError(Exception):
+    """
+    Raised when the bedrock-runtime client's connection went stale during a Converse call.
+    The original error is chained as __cause__.
+    """
+
+
+def supports_system_prompt(model_id: str) -> bool:
+    """
+    Checks whether a Bedrock model accepts a system prompt through the Converse API.
+
+    Parameters:
+        model_id (str): The Bedrock model identifier.
+
+    Returns:
+        bool: False for the models listed in _NO_SYSTEM_PROMPT_MODEL_PREFIXES.
+    """
+    return not model_id.startswith(_NO_SYSTEM_PROMPT_MODEL_PREFIXES)
+
+
+def to_converse_messages(messages: Sequence[BaseMessage]) -> List[Dict[str, Any]]:
+    """
+    Converts LangChain chat messages to Converse API messages. The conversation must start
+    with a user turn and alternate roles, so leading AI turns are dropped and consecutive
+    turns from the same role are merged. Messages that are neither human nor AI turns are skipped,
+    as are turns with blank text, which the Converse API rejects.
+
+    Parameters:
+        messages (list): The chat messages, oldest first.
+
+    Returns:
+        list: The messages as role/content dicts.
+    """
+    converse_messages: List[Dict[str, Any]] = []
+    for message in messages:
+        # Checked by class, not by type: turns stored from a stream are AIMessageChunk, type "AIMessageChunk"
+        if isinstance(message, HumanMessage):
+            role = "user"
+        elif isinstance(message, AIMessage):
+            role = "assistant"
+        else:
+            continue
+        text = message.content if isinstance(message.content, str) else str(message.content)
+        if not text.strip() or (not converse_messages and role != "user"):
+            continue
+        block = {"text": text}
+        if converse_messages and converse_messages[-1]["role"] == role:
+            converse_messages[-1]["content"].append(block)
+        else:
+            converse_messages.append({"role": role, "content": [block]})
+    return converse_messages
+
+
+async def astream_converse(
+    client: Any,
+    model_id: str,
+    system: str,
+    messages: List[Dict[str, Any]],
+    max_tokens: int,
+    temperature: float,
+    streaming_callback: AsyncStreamingCallback,
+) -> str:
+    """
+    Streams a response from a Bedrock model with the async Converse API, feeding text deltas
+    to the streaming callback as they arrive. The event loop stays free while the stream is read.
+
+    Parameters:
+        client: An open aioboto3 bedrock-runtime client.
+        model_id (str): The Bedrock model identifier.
+        system (str): The system prompt.
+        messages (list): The conversation as Converse API messages, ending with the user turn.
+        max_tokens (int): The maximum number of tokens for the model response.
+        temperature (float): The temperature to set for the model.
+        streaming_callback (AsyncStreamingCallback): Callback that publishes the stream.
+
+    Returns:
+        str: The full response text.
+
+    Raises:
+        BedrockConnectionError: If the Bedrock connection went stale.
+    """
+    request: Dict[str, Any] = {
+        "modelId": model_id,
+        "messages": messages,
+        "inferenceConfig": {"maxTokens": max_tokens, "temperature": temperature},
+    }
+    if supports_system_prompt(model_id):
+        request["system"] = [{"text": system}]
+    elif messages:
+        messages[0]["content"].insert(0, {"text": system})
+
+    await streaming_callback.on_llm_start(None, [])
+    try:
+        async for text in _stream_text(client, request):
+            await streaming_callback.on_llm_new_token(text)
+    except Exception as e:
+        await streaming_callback.on_llm_error(e)
+        raise
+
+    await streaming_callback.on_llm_end(None)
+    return streaming_callback.current_response
+
+
+async def _stream_text(client: Any, request: Dict[str, Any]) -> AsyncIterator[str]:
+    # Only the Bedrock calls run in here; errors from the callback (e.g. publishing to the
+    # WebSocket) are raised in the caller and are not attributed to the Bedrock client
+    try:
+        response = await client.converse_stream(**request)
+        async for event in response["stream"]:
+            delta = event.get("contentBlockDelta")
+            if delta is not None:
+                yield delta["delta"].get("text", "")
+    except Exception as e:
+        if is_stale_connection_error(e):
+            raise BedrockConnectionError(str(e)) from e
+        raise
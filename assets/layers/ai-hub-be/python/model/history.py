@@ -0,0 +1,167 @@
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+from botocore.exceptions import ClientError
+from langchain_community.chat_message_histories import DynamoDBChatMessageHistory
+from langchain_community.chat_message_histories.dynamodb import convert_messages
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, messages_to_dict
+
+LOGGER = logging.getLogger(__name__)
+
+
+def approximate_token_count(message: BaseMessage) -> int:
+    """
+    Estimates the number of tokens in a message without a model-specific tokenizer,
+    using roughly four characters per token plus a small per-message overhead.
+
+    Parameters:
+        message (BaseMessage): The message to measure.
+
+    Returns:
+        int: The estimated token count.
+    """
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    return len(content) // 4 + 4
+
+
+@lru_cache(maxsize=8)
+def get_dax_table(dax_endpoint: str, table_name: str) -> Any:
+    """
+    Returns a DAX-backed Table for the given cluster endpoint, shared across invocations.
+
+    Parameters:
+        dax_endpoint (str): The DAX cluster endpoint, e.g. dax://my-cluster.abc123.dax-clusters.us-west-2.amazonaws.com
+        table_name (str): The DynamoDB table behind the cluster.
+
+    Returns:
+        A Table resource whose reads and writes go through DAX.
+    """
+    from amazondax import AmazonDaxClient
+
+    return AmazonDaxClient.resource(endpoint_url=dax_endpoint).Table(table_name)
+
+
+class SharedTableChatMessageHistory(DynamoDBChatMessageHistory):
+    """
+    Chat message history stored in a DynamoDB Table that is shared across sessions.
+    DynamoDBChatMessageHistory builds a new boto3 resource per history; this reuses the given Table,
+    which may also be a DAX-backed Table from get_dax_table.
+    """
+
+    def __init__(
+        self,
+        table: Any,
+        session_id: str,
+        primary_key_name: str = "SessionId",
+        key: Optional[Dict[str, Any]] = None,
+        ttl: Optional[int] = None,
+        ttl_key_name: str = "expireAt",
+        history_size: Optional[int] = None,
+        history_messages_key: str = "History",
+        coerce_float_to_decimal: bool = False,
+    ) -> None:
+        """
+        Parameters:
+            table: The Table resource holding the chat history.
+            session_id (str): The session ID.
+            primary_key_name (str, optional): Name of the table's partition key. Defaults to "SessionId".
+            key (dict, optional): Full item key, for tables with a sort key. Defaults to {primary_key_name: session_id}.
+            ttl (int, optional): Seconds until stored items expire.
+            ttl_key_name (str, optional): Name of the TTL attribute. Defaults to "expireAt".
+            history_size (int, optional): Maximum number of messages to keep in the item.
+            history_messages_key (str, optional): Name of the attribute holding the messages. Defaults to "History".
+            coerce_float_to_decimal (bool, optional): Store float values in the messages as Decimal. Defaults to False.
+        """
+        # Same attributes DynamoDBChatMessageHistory.__init__ sets, without building a resource
+        self.table = table
+        self.session_id = session_id
+        self.key: Dict[str, Any] = key or {primary_key_name: session_id}
+        self.ttl = ttl
+        self.ttl_key_name = ttl_key_name
+        self.history_size = history_size
+        self.history_messages_key = history_messages_key
+        self.coerce_float_to_decimal = coerce_float_to_decimal
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        """
+        Appends the messages to the stored history with a single list_append update_item,
+        without reading the stored item first.
+
+        Parameters:
+            messages (list): The messages to append.
+        """
+        if self.history_size:
+            # Truncating to history_size needs the stored list, so keep the read-modify-write path.
+            # Not self.add_message: BaseChatMessageHistory routes that back into add_messages.
+            super().add_messages(messages)
+            return
+
+        update_expression = "SET #history = list_append(if_not_exists(#history, :empty), :messages)"
+        names = {"#history": self.history_messages_key}
+        message_dicts = messages_to_dict(messages)
+        if self.coerce_float_to_decimal:
+            # The boto3 resource rejects floats, same conversion as the inherited path
+            message_dicts = convert_messages(message_dicts)
+        values: Dict[str, Any] = {":messages": message_dicts, ":empty": []}
+        if self.ttl:
+            update_expression += ", #ttl = :ttl"
+            names["#ttl"] = self.ttl_key_name
+            values[":ttl"] = int(time.time()) + self.ttl
+
+        try:
+            self.table.update_item(
+                Key=self.key,
+                UpdateExpression=update_expression,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+        except ClientError as err:
+            # Same as DynamoDBChatMessageHistory: a failed write does not fail the turn
+            LOGGER.error(err)
+
+
+class PrefetchedChatMessageHistory(BaseChatMessageHistory):
+    """
+    Chat message history whose messages were already read for the current turn.
+    Reads are served from the prefetched messages; writes go to the wrapped history.
+    """
+
+    def __init__(self, history: BaseChatMessageHistory, messages: List[BaseMessage]) -> None:
+        """
+        Parameters:
+            history (BaseChatMessageHistory): The history that owns the stored messages.
+            messages (list): The messages already read from the history.
+        """
+        self.history = history
+        self._messages = list(messages)
+
+    @classmethod
+    async def aprefetch(cls, history: BaseChatMessageHistory) -> "PrefetchedChatMessageHistory":
+        """
+        Reads the messages of a history and wraps it.
+
+        Parameters:
+            history (BaseChatMessageHistory): The history to read.
+
+        Returns:
+            PrefetchedChatMessageHistory: The wrapped history.
+        """
+        return cls(history, await history.aget_messages())
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        return self._messages
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        self.history.add_messages(messages)
+        self._messages.extend(messages)
+
+    async def aadd_messages(self, messages: Sequence[BaseMessage]) -> None:
+        await self.history.aadd_messages(messages)
+        self._messages.extend(messages)
+
+    def clear(self) -> None:
+        self.history.clear()
+        self._messages = []
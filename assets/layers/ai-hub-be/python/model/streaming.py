@@ -1,46 +1,73 @@
-import json
-from langchain_core.callbacks import BaseCallbackHandler
+import time
+import orjson
+from langchain_core.callbacks import AsyncCallbackHandler
 from messaging.service import MessageDeliveryService
 from model.postprocess import clean_answer
 from utils.enums import WebSocketMessageFields as wssm
 from utils.enums import WebSocketMessageTypes as wsst
 
-class StreamingCallback(BaseCallbackHandler):
+# A stream update is posted once this many tokens are pending or this much time has passed
+FLUSH_MAX_TOKENS = 16
+FLUSH_INTERVAL_MS = 40
+
+class AsyncStreamingCallback(AsyncCallbackHandler):
     """
-    Custom streaming callback to be used with RunnableWithMessageHistory
+    Custom async streaming callback to be used with RunnableWithMessageHistory.
+    Each stream message carries the full response so far, so tokens are coalesced and
+    posted every FLUSH_MAX_TOKENS tokens or FLUSH_INTERVAL_MS milliseconds, whichever comes first.
     """
 
-    def __init__(self, message_service: MessageDeliveryService):
+    def __init__(self, message_service: MessageDeliveryService, flush_max_tokens: int = FLUSH_MAX_TOKENS, flush_interval_ms: float = FLUSH_INTERVAL_MS):
         self.current_response = ""
         self.message_service = message_service
+        self.flush_max_tokens = flush_max_tokens
+        self.flush_interval_ms = flush_interval_ms
+        self._pending_tokens = 0
+        self._last_flush = time.monotonic()
 
-    def on_llm_start(self, serialized, prompts, **kwargs) -> None:
+    async def on_llm_start(self, serialized, prompts, **kwargs) -> None:
         """Called when LLM starts running."""
         self.current_response = ""
+        self._pending_tokens = 0
+        self._last_flush = time.monotonic()
 
-    def on_llm_new_token(self, token: str, **kwargs) -> None:
+    async def on_llm_new_token(self, token: str, **kwargs) -> None:
         """
         Runs on each new token produced by LLM. Concatenates tokens and posts to message_service
+        once the flush window is reached
         """
         self.current_response += token
-        serialized_response_body = json.dumps({
-            wssm.MESSAGE: clean_answer(self.current_response) + "...",
-            wssm.TYPE: wsst.STREAM,
+        self._pending_tokens += 1
+        if (
+            self._pending_tokens >= self.flush_max_tokens
+            or (time.monotonic() - self._last_flush) * 1000 >= self.flush_interval_ms
+        ):
+            await self._flush()
+
+    async def _flush(self) -> None:
+        """Posts the response accumulated so far as a stream update."""
+        self._pending_tokens = 0
+        self._last_flush = time.monotonic()
+        serialized_response_body = orjson.dumps({
+            wssm.MESSAGE.value: clean_answer(self.current_response) + "...",
+            wssm.TYPE.value: wsst.STREAM,
         })
-        self.message_service.post(payload=serialized_response_body)
+        await self.message_service.publish_async(payload=serialized_response_body)
 
-    def on_llm_end(self, response, **kwargs) -> None:
-        """Called when LLM generation ends."""
-        serialized_response_body = json.dumps({
-            wssm.MESSAGE: clean_answer(self.current_response),
-            wssm.TYPE: wsst.END,
+    async def on_llm_end(self, response, **kwargs) -> None:
+        """Called when LLM generation ends. The end message carries any tokens still pending."""
+        serialized_response_body = orjson.dumps({
+            wssm.MESSAGE.value: clean_answer(self.current_response),
+            wssm.TYPE.value: wsst.END,
         })
-        self.message_service.post(payload=serialized_response_body)
+        await self.message_service.publish_async(payload=serialized_response_body)
 
-    def on_llm_error(self, error: Exception, **kwargs) -> None:
+    async def on_llm_error(self, error: Exception, **kwargs) -> None:
         """Called when LLM encounters an error."""
-        serialized_response_body = json.dumps({
-            wssm.MESSAGE: f"Error occurred: {str(error)}",
-            wssm.TYPE: wsst.ERROR,
+        if self._pending_tokens:
+            await self._flush()
+        serialized_response_body = orjson.dumps({
+            wssm.MESSAGE.value: f"Error occurred: {str(error)}",
+            wssm.TYPE.value: wsst.ERROR,
         })
-        self.message_service.post(payload=serialized_response_body)
+        await self.message_service.publish_async(payload=serialized_response_body)
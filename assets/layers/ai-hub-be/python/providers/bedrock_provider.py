@@ -1,55 +1,112 @@
 import boto3
-from langchain_aws import ChatBedrock
-from model.streaming import StreamingCallback
+from model.streaming import AsyncStreamingCallback
 from providers.base_provider import BaseProvider
+from utils.aws import BOTO_CLIENT_CONFIG
+from utils.cache import LLM_CACHE_MAX_SIZE, LRUCache
 import os
 import logging
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from langchain_aws import ChatBedrock
+
+# bedrock-runtime clients per region, reused for the life of the container
+_BEDROCK_CLIENTS: Dict[str, Any] = {}
+
+
+def get_bedrock_client(region: str) -> Any:
+    """
+    Returns the bedrock-runtime client for a region, created on first use.
+
+    Parameters:
+        region (str): The AWS region.
+
+    Returns:
+        The boto3 bedrock-runtime client.
+    """
+    client = _BEDROCK_CLIENTS.get(region)
+    if client is None:
+        client = _BEDROCK_CLIENTS[region] = boto3.client('bedrock-runtime', region_name=region, config=BOTO_CLIENT_CONFIG)
+    return client
+
+
+def invalidate_bedrock_client(region: str) -> None:
+    """
+    Drops the cached bedrock-runtime client for a region, and the LLMs built on it, so the
+    next request creates a fresh connection pool. Call this after a stale-connection error.
+
+    Parameters:
+        region (str): The AWS region.
+    """
+    client = _BEDROCK_CLIENTS.pop(region, None)
+    if client is not None:
+        for cache_key in [cache_key for cache_key in _LLM_CACHE if cache_key[3] == id(client)]:
+            _LLM_CACHE.pop(cache_key)
+
+
+# Callback-free ChatBedrock instances keyed by (model_id, max_tokens, temperature, client id),
+# least recently used first out
+_LLM_CACHE = LRUCache(LLM_CACHE_MAX_SIZE)
 
 class BedrockProvider(BaseProvider):
     """
     Provider implementation for AWS Bedrock Models
     """
 
-    def __init__(self, model_id: str, streaming_callback: StreamingCallback, max_tokens: int = 1000, temperature: float = .7, region: str = None) -> None:
+    def __init__(self, model_id: str, streaming_callback: AsyncStreamingCallback = None, max_tokens: int = 1000, temperature: float = .7, region: str = None, client: Any = None) -> None:
         """
         Initialize the BedrockProvider with necessary parameters.
 
         Parameters:
             model_id (str): The model identifier for Bedrock.
-            streaming_callback (StreamingCallback): Callback handler for streaming responses.
+            streaming_callback (AsyncStreamingCallback, optional): Callback handler for streaming responses.
             max_tokens (int, optional): Maximum number of tokens in the model's response. Defaults to 1000.
             temperature (float, optional): Temperature to set for the model. Defaults to 0.7.
             region (str, optional): AWS region where Bedrock is deployed. Defaults to environment variable.
+            client (optional): Existing bedrock-runtime client to use instead of creating one.
         """
         self.model_id = model_id
         self.streaming_callback = streaming_callback
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.region = region or os.environ.get('REGION', 'us-west-2')
+        self.client = client
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.logger.debug(f"Initialized BedrockProvider with model_id: {self.model_id}, region: {self.region}, max_tokens: {self.max_tokens}, temperature: {self.temperature}")
+        self.logger.debug("Initialized BedrockProvider with model_id: %s, region: %s, max_tokens: %s, temperature: %s", self.model_id, self.region, self.max_tokens, self.temperature)
     
-    def get_llm(self) -> ChatBedrock:
+    def get_llm(self) -> "ChatBedrock":
         """
         Instantiate and return the ChatBedrock LLM.
+        Without a streaming callback the instance is cached and shared; bind callbacks per call with `.with_config`.
 
         Returns:
             ChatBedrock: An instance of ChatBedrock configured with the specified model and callback.
         """
+        bedrock_client = self.client or get_bedrock_client(self.region)
+        cache_key = None
+        if not self.streaming_callback:
+            cache_key = (self.model_id, self.max_tokens, self.temperature, id(bedrock_client))
+            llm = _LLM_CACHE.get(cache_key)
+            if llm is not None:
+                return llm
+
+        # Imported here so the LangChain integration is only loaded once a Bedrock LLM is built
+        from langchain_aws import ChatBedrock
+
         try:
-            bedrock_client = boto3.client('bedrock-runtime', region_name=self.region)
             llm = ChatBedrock(
                 client=bedrock_client,
                 model_id=self.model_id,
                 streaming=True,
-                callbacks=[self.streaming_callback],
-                model_kwargs={
-                    "max_tokens": self.max_tokens,
-                    "temperature": self.temperature
-                }
+                callbacks=[self.streaming_callback] if self.streaming_callback else None,
+                # First-class fields are mapped to each model family's request format (e.g. max_gen_len for Llama)
+                max_tokens=self.max_tokens,
+                temperature=self.temperature
             )
-            self.logger.debug(f"ChatBedrock LLM initialized with model_id: {self.model_id}, max_tokens: {self.max_tokens}, temperature: {self.temperature}")
+            if cache_key:
+                _LLM_CACHE.put(cache_key, llm)
+            self.logger.debug("ChatBedrock LLM initialized with model_id: %s, max_tokens: %s, temperature: %s", self.model_id, self.max_tokens, self.temperature)
             return llm
         except Exception as e:
-            self.logger.error(f"Failed to initialize Bedrock LLM: {e}")
+            self.logger.error("Failed to initialize Bedrock LLM: %s", e)
             raise e
\ No newline at end of file
@@ -1,5 +1,5 @@
 # from langchain_google_genai import ChatGoogleGenerativeAI
-# from model.streaming import StreamingCallback
+# from model.streaming import AsyncStreamingCallback
 # from providers.base_provider import BaseProvider
 # import logging
 
@@ -7,7 +7,7 @@
 #     """
 #     Provider implementation for Google AI Models
 #     """
-#     def __init__(self, model_id: str, api_key: str, streaming_callback: StreamingCallback, max_output_tokens: int = 1000, temperature: float = 0.7) -> None:
+#     def __init__(self, model_id: str, api_key: str, streaming_callback: AsyncStreamingCallback, max_output_tokens: int = 1000, temperature: float = 0.7) -> None:
 #         """
 #         Initialize the GoogleProvider with necessary parameters.
 #         Parameters:
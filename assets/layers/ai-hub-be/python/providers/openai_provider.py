@@ -1,19 +1,37 @@
-from langchain_openai import ChatOpenAI
-from model.streaming import StreamingCallback
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+import httpx
+from model.streaming import AsyncStreamingCallback
 from providers.base_provider import BaseProvider
+from utils.cache import LLM_CACHE_MAX_SIZE, LRUCache
+import hashlib
 import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+# Connection pools shared by every ChatOpenAI instance in the process, so all models keep
+# their TLS sessions to the OpenAI API alive across requests. HTTP/2 lets concurrent
+# streams share one connection.
+_HTTPX_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_HTTP_CLIENT = DefaultHttpxClient(http2=True, limits=_HTTPX_LIMITS)
+_HTTP_ASYNC_CLIENT = DefaultAsyncHttpxClient(http2=True, limits=_HTTPX_LIMITS)
+
+# Callback-free ChatOpenAI instances keyed by (model_id, api key digest, max_tokens, temperature).
+# A rotated API key produces a new key, so the old instance is never used again and ages out.
+_LLM_CACHE = LRUCache(LLM_CACHE_MAX_SIZE)
 
 class OpenAIProvider(BaseProvider):
     """
     Provider implementation for OpenAI Models
     """
-    def __init__(self, model_id: str, api_key: str, streaming_callback: StreamingCallback, max_tokens: int = 1000, temperature: float = .7) -> None:
+    def __init__(self, model_id: str, api_key: str, streaming_callback: AsyncStreamingCallback = None, max_tokens: int = 1000, temperature: float = .7) -> None:
         """
         Initialize the OpenAIProvider with necessary parameters.
         Parameters:
         model_id (str): The model identifier for OpenAI.
         api_key (str): API key for accessing OpenAI models.
-        streaming_callback: Callback handler for streaming responses.
+        streaming_callback (optional): Callback handler for streaming responses.
         max_tokens (int, optional): Maximum number of tokens in the model's response. Defaults to 1000.
         temperature (float, optional): Temperature to set for the model. Defaults to 0.7.
         """
@@ -23,25 +41,40 @@ class OpenAIProvider(BaseProvider):
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.logger.debug(f"Initialized OpenAIProvider with model_id: {self.model_id}, max_tokens: {self.max_tokens}, temperature: {self.temperature}")
+        self.logger.debug("Initialized OpenAIProvider with model_id: %s, max_tokens: %s, temperature: %s", self.model_id, self.max_tokens, self.temperature)
 
-    def get_llm(self) -> ChatOpenAI:
+    def get_llm(self) -> "ChatOpenAI":
         """
         Instantiate and return the ChatOpenAI LLM.
+        Without a streaming callback the instance is cached and shared; bind callbacks per call with `.with_config`.
         Returns:
         ChatOpenAI: An instance of ChatOpenAI configured with the specified model and token limit.
         """
+        cache_key = None
+        if not self.streaming_callback:
+            cache_key = (self.model_id, hashlib.sha256(self.api_key.encode()).hexdigest(), self.max_tokens, self.temperature)
+            llm = _LLM_CACHE.get(cache_key)
+            if llm is not None:
+                return llm
+
+        # Imported here so the LangChain integration is only loaded once an OpenAI LLM is built
+        from langchain_openai import ChatOpenAI
+
         try:
             llm = ChatOpenAI(
                 api_key=self.api_key,
                 model=self.model_id,
                 streaming=True,
-                callbacks=[self.streaming_callback],
+                callbacks=[self.streaming_callback] if self.streaming_callback else None,
                 max_tokens=self.max_tokens,
-                temperature=self.temperature
+                temperature=self.temperature,
+                http_client=_HTTP_CLIENT,
+                http_async_client=_HTTP_ASYNC_CLIENT
             )
-            self.logger.debug(f"ChatOpenAI LLM initialized with model_id: {self.model_id}, max_tokens: {self.max_tokens}, temperature: {self.temperature}")
+            if cache_key:
+                _LLM_CACHE.put(cache_key, llm)
+            self.logger.debug("ChatOpenAI LLM initialized with model_id: %s, max_tokens: %s, temperature: %s", self.model_id, self.max_tokens, self.temperature)
             return llm
         except Exception as e:
-            self.logger.error(f"Failed to initialize OpenAI LLM: {e}")
+            self.logger.error("Failed to initialize OpenAI LLM: %s", e)
             raise e
\ No newline at end of file
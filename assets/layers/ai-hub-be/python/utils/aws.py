@@ -0,0 +1,11 @@
+from botocore.config import Config
+
+# Shared AWS client configuration: keep connections alive between warm invocations,
+# fail fast on connect and let botocore's adaptive retry mode absorb throttling.
+BOTO_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=64,
+    connect_timeout=1,
+    read_timeout=60,
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+)
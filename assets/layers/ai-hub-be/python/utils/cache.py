@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Iterator, Optional
+
+# Upper bound for the per-container LLM and chain caches. Their keys include request-supplied
+# values such as max_tokens and temperature, so they must not grow with the number of distinct requests.
+LLM_CACHE_MAX_SIZE = 16
+
+
+class LRUCache:
+    """
+    Mapping that holds at most max_size entries, evicting the least recently used one first.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        Parameters:
+            max_size (int): The maximum number of entries kept.
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Returns the value for a key and marks it as the most recently used.
+
+        Parameters:
+            key: The cache key.
+            default (optional): Value returned when the key is not cached.
+
+        Returns:
+            The cached value, or default.
+        """
+        if key not in self._entries:
+            return default
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value, evicting the least recently used entries beyond max_size.
+
+        Parameters:
+            key: The cache key.
+            value: The value to store.
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        return self._entries.pop(key, default)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
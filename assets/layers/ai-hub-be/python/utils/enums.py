@@ -28,7 +28,7 @@ class WebSocketMessageTypes(str, Enum):
 class WebSocketMessageActions(str, Enum):
     CLOSE = "close"
 
-class Provider(Enum):
+class Provider(str, Enum):
     BEDROCK = "bedrock"
     OPENAI = "openai"
     GOOGLE = "google"
@@ -0,0 +1,43 @@
+from botocore.exceptions import ConnectionError as BotocoreConnectionError, HTTPClientError
+from urllib3.exceptions import ProtocolError
+
+# Modules whose assertion failures mean the pooled connection is in a bad state
+_HTTP_STACK_MODULES = ("urllib3.", "botocore.", "boto3.")
+
+
+def is_stale_connection_error(exc: BaseException) -> bool:
+    """
+    Checks whether an exception means a cached client's connection pool is no longer usable,
+    e.g. a socket reset by a NAT or idle timeout, so the client should be rebuilt.
+
+    Parameters:
+        exc (BaseException): The exception raised by a client call.
+
+    Returns:
+        bool: True if the client that raised it should be discarded.
+    """
+    # Follow the chain too: LangChain re-raises client errors as ValueError
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if _is_stale_connection_error(exc):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _is_stale_connection_error(exc: BaseException) -> bool:
+    # Covers EndpointConnectionError, ConnectTimeoutError, ConnectionClosedError and ReadTimeoutError
+    if isinstance(exc, (BotocoreConnectionError, HTTPClientError, ProtocolError)):
+        return True
+
+    if isinstance(exc, AssertionError):
+        tb = exc.__traceback__
+        if tb is None:
+            return False
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+        module = tb.tb_frame.f_globals.get("__name__", "")
+        return module.startswith(_HTTP_STACK_MODULES)
+
+    return False
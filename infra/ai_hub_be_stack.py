@@ -7,6 +7,18 @@ from constructs import Construct
 from infra.constructs.lambda_layers import LambdaLayers
 from infra.constructs.api_construct import ApiConstruct
 
+# Supported config values, mapped to their CDK types
+_ARCHITECTURES = {
+    "X86_64": _lambda.Architecture.X86_64,
+    "ARM_64": _lambda.Architecture.ARM_64,
+}
+_RUNTIMES = {
+    "PYTHON_3_9": _lambda.Runtime.PYTHON_3_9,
+    "PYTHON_3_10": _lambda.Runtime.PYTHON_3_10,
+    "PYTHON_3_11": _lambda.Runtime.PYTHON_3_11,
+    "PYTHON_3_12": _lambda.Runtime.PYTHON_3_12,
+}
+
 class AiHubBeStack(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs):
         super().__init__(scope, construct_id, **kwargs)
@@ -19,21 +31,17 @@ class AiHubBeStack(Stack):
             api_key_config = yaml.safe_load(api_key_file)
 
         # Set architecture
-        architecture = _lambda.Architecture.X86_64
-        if config["lambda"]["architecture"].upper() == "ARM_64":
-            architecture = _lambda.Architecture.ARM_64
+        architecture_str = config["lambda"]["architecture"].upper()
+        try:
+            architecture = _ARCHITECTURES[architecture_str]
+        except KeyError:
+            raise ValueError(f"Unsupported architecture: {architecture_str}")
 
         # Set Python runtime
         python_runtime_str = config["lambda"]["python_runtime"]
-        if python_runtime_str == "PYTHON_3_9":
-            python_runtime = _lambda.Runtime.PYTHON_3_9
-        elif python_runtime_str == "PYTHON_3_10":
-            python_runtime = _lambda.Runtime.PYTHON_3_10
-        elif python_runtime_str == "PYTHON_3_11":
-            python_runtime = _lambda.Runtime.PYTHON_3_11
-        elif python_runtime_str == "PYTHON_3_12":
-            python_runtime = _lambda.Runtime.PYTHON_3_12
-        else:
+        try:
+            python_runtime = _RUNTIMES[python_runtime_str]
+        except KeyError:
             raise ValueError(f"Unsupported Python runtime: {python_runtime_str}")
 
         # Get values from config
@@ -43,6 +51,8 @@ class AiHubBeStack(Stack):
         google_secret_arn = api_key_config["google"]["secret_arn"]
         max_tokens = str(config["model"]["max_tokens"])
         temperature = str(config["model"]["temperature"])
+        chat_snap_start = bool(config["lambda"].get("chat_snap_start", False))
+        chat_provisioned_concurrency = config["lambda"].get("chat_provisioned_concurrency") or None
 
         ## **************** Lambda Layers ****************
         self.layers = LambdaLayers(
@@ -66,5 +76,7 @@ class AiHubBeStack(Stack):
             google_secret_name=google_secret_name,
             google_secret_arn=google_secret_arn,
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            chat_snap_start=chat_snap_start,
+            chat_provisioned_concurrency=chat_provisioned_concurrency
         )
\ No newline at end of file
@@ -26,7 +26,9 @@ class ApiConstruct(Construct):
         google_secret_name: str,
         google_secret_arn: str,
         max_tokens: str,
-        temperature: str
+        temperature: str,
+        chat_snap_start: bool = False,
+        chat_provisioned_concurrency: int = None
     ):
         super().__init__(scope, id)
 
@@ -121,6 +123,10 @@ class ApiConstruct(Construct):
                 "DEFAULT_MAX_TOKENS": max_tokens,
                 "DEFAULT_TEMPERATURE": temperature
             },
+            # One full vCPU: imports and token handling in the chat handler are CPU bound
+            memory_size=1769,
+            snap_start=chat_snap_start,
+            provisioned_concurrent_executions=chat_provisioned_concurrency,
         )
 
         # Grant necessary permissions
@@ -137,6 +143,7 @@ class ApiConstruct(Construct):
         chat_handler.grant_bedrock_access()
         chat_handler.grant_secrets_manager_access(openai_secret_arn)
         chat_handler.grant_secrets_manager_access(google_secret_arn)
+        chat_handler.grant_secrets_manager_batch_access()
 
         # Add routes to the WebSocket API
         self.web_socket_api.add_route(
@@ -164,7 +171,7 @@ class ApiConstruct(Construct):
             route_key="chat",
             integration=integrations.WebSocketLambdaIntegration(
                 f"{stack_name}-ChatIntegration",
-                chat_handler.function,
+                chat_handler.invoke_target,
             ),
         )
 
@@ -181,6 +188,9 @@ class ApiConstruct(Construct):
         architecture: _lambda.Architecture,
         layers=None,
         environment=None,
+        memory_size=256,
+        snap_start=False,
+        provisioned_concurrent_executions=None,
     ) -> LambdaConstruct:
         lambda_construct = LambdaConstruct(
             self,
@@ -192,5 +202,8 @@ class ApiConstruct(Construct):
             architecture=architecture,
             layers=layers,
             environment=environment,
+            memory_size=memory_size,
+            snap_start=snap_start,
+            provisioned_concurrent_executions=provisioned_concurrent_executions,
         )
         return lambda_construct
\ No newline at end of file
@@ -1,10 +1,14 @@
 from aws_cdk import (
     aws_lambda as _lambda,
     aws_iam as iam,
+    Aws,
     Duration,
 )
 from constructs import Construct
 
+# Runtimes that support SnapStart
+_SNAP_START_RUNTIMES = ("python3.12", "python3.13")
+
 class LambdaConstruct(Construct):
     def __init__(
         self,
@@ -20,9 +24,16 @@ class LambdaConstruct(Construct):
         environment=None,
         timeout=Duration.minutes(15),
         memory_size=256,
+        snap_start=False,
+        provisioned_concurrent_executions=None,
     ):
         super().__init__(scope, id)
 
+        if snap_start and provisioned_concurrent_executions:
+            raise ValueError("SnapStart and provisioned concurrency cannot be enabled on the same function")
+        if snap_start and runtime.name not in _SNAP_START_RUNTIMES:
+            raise ValueError(f"SnapStart is not supported for runtime: {runtime.name}")
+
         self.function = _lambda.Function(
             self,
             id,
@@ -37,6 +48,25 @@ class LambdaConstruct(Construct):
             memory_size=memory_size,
         )
 
+        if snap_start:
+            # Set on the L1 resource; this CDK version only allows snap_start for Java runtimes
+            self.function.node.default_child.snap_start = _lambda.CfnFunction.SnapStartProperty(
+                apply_on="PublishedVersions"
+            )
+
+        # SnapStart and provisioned concurrency only apply to published versions, so those
+        # functions are invoked through an alias on the latest version
+        self.alias = None
+        if snap_start or provisioned_concurrent_executions:
+            self.alias = _lambda.Alias(
+                self,
+                f"{id}-live",
+                alias_name="live",
+                version=self.function.current_version,
+                provisioned_concurrent_executions=provisioned_concurrent_executions,
+            )
+        self.invoke_target = self.alias or self.function
+
     def grant_dynamodb_access(self, table):
         table.grant_read_write_data(self.function)
 
@@ -53,10 +83,18 @@ class LambdaConstruct(Construct):
         )
 
     def grant_bedrock_access(self):
+        # Converse/ConverseStream are authorized as InvokeModel/InvokeModelWithResponseStream.
+        # Cross-region inference profiles (us.*) route to foundation models in other regions.
         self.function.add_to_role_policy(
             iam.PolicyStatement(
-                actions=["bedrock:*"],
-                resources=["*"],
+                actions=[
+                    "bedrock:InvokeModel",
+                    "bedrock:InvokeModelWithResponseStream",
+                ],
+                resources=[
+                    "arn:aws:bedrock:*::foundation-model/*",
+                    f"arn:aws:bedrock:{Aws.REGION}:{Aws.ACCOUNT_ID}:inference-profile/*",
+                ],
             )
         )
     
@@ -74,4 +112,13 @@ class LambdaConstruct(Construct):
                 actions=["secretsmanager:GetSecretValue"],
                 resources=[secret_arn]
             )
+        )
+    
+    def grant_secrets_manager_batch_access(self):
+        # BatchGetSecretValue has no resource-level permissions; each secret still needs GetSecretValue
+        self.function.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["secretsmanager:BatchGetSecretValue"],
+                resources=["*"],
+            )
         )
\ No newline at end of file
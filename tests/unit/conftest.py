@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Lambda layer modules are imported from the layer root, as they are at runtime under /opt/python
+LAYER_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "assets", "layers", "ai-hub-be", "python")
+sys.path.insert(0, os.path.abspath(LAYER_PATH))
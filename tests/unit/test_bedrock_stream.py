@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from botocore.exceptions import EndpointConnectionError
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+
+from model.bedrock_stream import BedrockConnectionError, astream_converse, to_converse_messages
+
+
+class FakeConverseClient:
+    def __init__(self, error=None):
+        self.error = error
+
+    async def converse_stream(self, **request):
+        if self.error is not None:
+            raise self.error
+        return {"stream": self._events()}
+
+    async def _events(self):
+        for text in ("Hel", "lo"):
+            yield {"contentBlockDelta": {"delta": {"text": text}}}
+
+
+class FakeCallback:
+    def __init__(self, error=None):
+        self.error = error
+        self.current_response = ""
+        self.errors = []
+
+    async def on_llm_start(self, serialized, prompts):
+        pass
+
+    async def on_llm_new_token(self, token):
+        if self.error is not None:
+            raise self.error
+        self.current_response += token
+
+    async def on_llm_end(self, response):
+        pass
+
+    async def on_llm_error(self, error):
+        self.errors.append(error)
+
+
+def _converse(client, callback):
+    messages = [{"role": "user", "content": [{"text": "hi"}]}]
+    return asyncio.run(astream_converse(client, "anthropic.claude-3-haiku", "system", messages, 100, 0.5, callback))
+
+
+def test_stored_stream_chunks_are_assistant_turns():
+    messages = [
+        HumanMessage(content="hi"),
+        AIMessageChunk(content="hello"),
+        HumanMessage(content="how are you?"),
+        AIMessageChunk(content="fine"),
+        HumanMessage(content="good"),
+    ]
+
+    converse_messages = to_converse_messages(messages)
+
+    assert [m["role"] for m in converse_messages] == ["user", "assistant", "user", "assistant", "user"]
+    assert converse_messages[1]["content"] == [{"text": "hello"}]
+    assert converse_messages[3]["content"] == [{"text": "fine"}]
+
+
+def test_leading_ai_turns_dropped_and_same_role_turns_merged():
+    messages = [
+        AIMessage(content="greeting"),
+        SystemMessage(content="ignored"),
+        HumanMessage(content="a"),
+        HumanMessage(content="b"),
+        AIMessage(content="c"),
+    ]
+
+    converse_messages = to_converse_messages(messages)
+
+    assert converse_messages == [
+        {"role": "user", "content": [{"text": "a"}, {"text": "b"}]},
+        {"role": "assistant", "content": [{"text": "c"}]},
+    ]
+
+
+def test_blank_turns_are_skipped():
+    messages = [
+        HumanMessage(content="hi"),
+        AIMessage(content=""),
+        HumanMessage(content="x"),
+        AIMessageChunk(content="  "),
+        HumanMessage(content=" \n"),
+    ]
+
+    converse_messages = to_converse_messages(messages)
+
+    assert converse_messages == [{"role": "user", "content": [{"text": "hi"}, {"text": "x"}]}]
+
+
+def test_stream_text_is_fed_to_the_callback():
+    callback = FakeCallback()
+
+    assert _converse(FakeConverseClient(), callback) == "Hello"
+
+
+def test_stale_bedrock_connection_is_raised_as_bedrock_error():
+    stale = EndpointConnectionError(endpoint_url="https://bedrock-runtime.us-west-2.amazonaws.com")
+    callback = FakeCallback()
+
+    with pytest.raises(BedrockConnectionError) as excinfo:
+        _converse(FakeConverseClient(error=stale), callback)
+
+    assert excinfo.value.__cause__ is stale
+    assert callback.errors == [excinfo.value]
+
+
+def test_callback_errors_are_not_attributed_to_bedrock():
+    publish_error = EndpointConnectionError(endpoint_url="https://example.execute-api.us-west-2.amazonaws.com")
+
+    with pytest.raises(EndpointConnectionError):
+        _converse(FakeConverseClient(), FakeCallback(error=publish_error))
@@ -0,0 +1,27 @@
+from utils.cache import LRUCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert list(cache) == ["a", "c"]
+    assert len(cache) == 2
+
+
+def test_pop_and_clear():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    assert cache.get("a", "missing") == "missing"
+
+    cache.put("b", 2)
+    cache.clear()
+    assert len(cache) == 0
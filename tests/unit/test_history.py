@@ -0,0 +1,85 @@
+import re
+from decimal import Decimal
+
+from langchain_core.messages import AIMessage, HumanMessage, messages_to_dict
+
+from model.history import SharedTableChatMessageHistory
+
+# "name = :value" and "name = list_append(if_not_exists(name, :empty), :value)" SET assignments
+_ASSIGNMENT = re.compile(r"([#\w]+) = (?:list_append\(if_not_exists\([#\w]+, (:\w+)\), (:\w+)\)|(:\w+))")
+
+
+class FakeTable:
+    """
+    In-memory stand-in for a DynamoDB Table resource holding one item. Applies put_item and
+    the SET update expressions used by the history classes, and records every update_item call.
+    """
+
+    def __init__(self, item=None):
+        self.item = item
+        self.update_calls = []
+
+    def get_item(self, Key):
+        return {"Item": self.item} if self.item is not None else {}
+
+    def put_item(self, Item):
+        self.item = Item
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ExpressionAttributeNames=None):
+        self.update_calls.append({
+            "Key": Key,
+            "UpdateExpression": UpdateExpression,
+            "ExpressionAttributeNames": ExpressionAttributeNames,
+            "ExpressionAttributeValues": ExpressionAttributeValues,
+        })
+        names = ExpressionAttributeNames or {}
+        item = self.item if self.item is not None else dict(Key)
+        for name, empty, appended, value in _ASSIGNMENT.findall(UpdateExpression):
+            attribute = names.get(name, name)
+            if appended:
+                item[attribute] = item.get(attribute, ExpressionAttributeValues[empty]) + ExpressionAttributeValues[appended]
+            else:
+                item[attribute] = ExpressionAttributeValues[value]
+        self.item = item
+
+
+def test_add_messages_appends_with_a_single_update():
+    table = FakeTable()
+    history = SharedTableChatMessageHistory(table=table, session_id="s1", primary_key_name="session_id", ttl=60)
+    messages = [HumanMessage(content="hi"), AIMessage(content="hello")]
+
+    history.add_messages(messages)
+
+    assert len(table.update_calls) == 1
+    call = table.update_calls[0]
+    assert call["Key"] == {"session_id": "s1"}
+    assert call["UpdateExpression"] == (
+        "SET #history = list_append(if_not_exists(#history, :empty), :messages), #ttl = :ttl"
+    )
+    assert call["ExpressionAttributeNames"] == {"#history": "History", "#ttl": "expireAt"}
+    assert call["ExpressionAttributeValues"][":messages"] == messages_to_dict(messages)
+    assert [m.content for m in history.messages] == ["hi", "hello"]
+
+
+def test_add_messages_with_history_size_truncates_stored_history():
+    stored = [HumanMessage(content="old question"), AIMessage(content="old answer")]
+    table = FakeTable(item={"session_id": "s1", "History": messages_to_dict(stored)})
+    history = SharedTableChatMessageHistory(
+        table=table, session_id="s1", primary_key_name="session_id", history_size=2
+    )
+
+    history.add_messages([HumanMessage(content="new question"), AIMessage(content="new answer")])
+
+    assert [m.content for m in history.messages] == ["new question", "new answer"]
+
+
+def test_add_messages_coerces_floats_to_decimal():
+    table = FakeTable()
+    history = SharedTableChatMessageHistory(
+        table=table, session_id="s1", primary_key_name="session_id", coerce_float_to_decimal=True
+    )
+
+    history.add_messages([AIMessage(content="hello", additional_kwargs={"score": 0.5})])
+
+    stored = table.update_calls[0]["ExpressionAttributeValues"][":messages"]
+    assert stored[0]["data"]["additional_kwargs"]["score"] == Decimal("0.5")